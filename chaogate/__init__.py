@@ -6,6 +6,7 @@ with warnings.catch_warnings(): #ignore warnings
     
     import copy
     import os
+    from collections import namedtuple
     import matplotlib.pyplot as plt
     import numpy as np
     import gzip
@@ -31,4 +32,9 @@ with warnings.catch_warnings(): #ignore warnings
     from tqdm import tqdm
     
     from chaogate.core import *
-    from chaogate.plotting import *
\ No newline at end of file
+    from chaogate.plotting import *
+    from chaogate.compact import *
+    from chaogate.network import *
+    from chaogate.logic import *
+    from chaogate.sampling import *
+    from chaogate.catalogue import *
\ No newline at end of file
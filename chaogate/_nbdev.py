@@ -10,6 +10,7 @@ index = {"global_path": "00_core.ipynb",
          "chaogate.Vin_slice": "00_core.ipynb",
          "sweep": "00_core.ipynb",
          "print_xar": "00_core.ipynb",
+         "iterate_kernel": "00_core.ipynb",
          "iterate_map": "00_core.ipynb",
          "iterate": "00_core.ipynb",
          "lyapunov": "00_core.ipynb",
@@ -19,15 +20,54 @@ index = {"global_path": "00_core.ipynb",
          "booleanize": "00_core.ipynb",
          "boolean_gradient": "00_core.ipynb",
          "boolean_divergence": "00_core.ipynb",
+         "Buffer": "00_core.ipynb",
+         "allocate": "00_core.ipynb",
+         "share": "00_core.ipynb",
+         "buffer_data": "00_core.ipynb",
+         "contiguous_view": "00_core.ipynb",
+         "attach": "00_core.ipynb",
+         "attach.buffers": "00_core.ipynb",
+         "release": "00_core.ipynb",
+         "buffer_worker": "00_core.ipynb",
          "format_equality": "01_plotting.ipynb",
          "format_label": "01_plotting.ipynb",
          "axes": "01_plotting.ipynb",
          "sample_ar": "01_plotting.ipynb",
          "plot_sweep": "01_plotting.ipynb",
-         "plot_bifurcate": "01_plotting.ipynb"}
+         "plot_bifurcate": "01_plotting.ipynb",
+         "compact_model": "02_compact.ipynb",
+         "compact_bounds": "02_compact.ipynb",
+         "pack_model": "02_compact.ipynb",
+         "compact_params": "02_compact.ipynb",
+         "ekv_current": "02_compact.ipynb",
+         "chaogate_kcl": "02_compact.ipynb",
+         "compact_solve": "02_compact.ipynb",
+         "compact_grid": "02_compact.ipynb",
+         "compact_sweep": "02_compact.ipynb",
+         "curve_params": "02_compact.ipynb",
+         "calibrate": "02_compact.ipynb",
+         "ring": "03_network.ipynb",
+         "lattice": "03_network.ipynb",
+         "coupling": "03_network.ipynb",
+         "uniform_interp": "03_network.ipynb",
+         "network_map": "03_network.ipynb",
+         "stream_network": "03_network.ipynb",
+         "network": "03_network.ipynb",
+         "logic_names": "04_logic.ipynb",
+         "logic_inputs": "04_logic.ipynb",
+         "logic_map": "04_logic.ipynb",
+         "logic": "04_logic.ipynb",
+         "design": "05_sampling.ipynb",
+         "scatter": "05_sampling.ipynb",
+         "Catalogue": "06_catalogue.ipynb"}
 
 modules = ["core.py",
-           "plotting.py"]
+           "plotting.py",
+           "compact.py",
+           "network.py",
+           "logic.py",
+           "sampling.py",
+           "catalogue.py"]
 
 doc_url = "https://Noeloikeau.github.io/chaogate/"
 
@@ -0,0 +1,188 @@
+# AUTOGENERATED! DO NOT EDIT! File to edit: 06_catalogue.ipynb (unless otherwise specified).
+
+__all__ = ['Catalogue']
+
+# Cell
+from chaogate import *
+import inspect
+import json
+from scipy.spatial import cKDTree
+
+# Cell
+class Catalogue:
+    '''
+    Persistent catalogue of transfer curves in the folder `path`,
+    indexed by the circuit parameters `params` (by default those
+    of `compact_params`). An existing catalogue is opened as is.
+    '''
+    def __init__(self,
+                 path : str,
+                 params : Sequence[str] = tuple(compact_params),
+                 rebuild : float = 0.1):
+        self.path = path
+        self.rebuild = rebuild
+        meta = os.path.join(path,'catalogue.json')
+        if os.path.exists(meta):
+            with open(meta) as f:
+                m = json.load(f)
+            self.params = tuple(m['params'])
+            self.Vin = None if m['Vin'] is None else np.array(m['Vin'])
+            self.count = m['count']
+        else:
+            os.makedirs(path,exist_ok=True)
+            self.params = tuple(params)
+            self.Vin = None
+            self.count = 0
+            self.write_meta()
+        self.load()
+
+    def write_meta(self):
+        'Writes the parameter names, `Vin` and count to `catalogue.json`.'
+        with open(os.path.join(self.path,'catalogue.json'),'w') as f:
+            json.dump(dict(params=self.params,
+                           Vin=None if self.Vin is None else self.Vin.tolist(),
+                           count=self.count),f)
+
+    def load(self):
+        'Reads the stored rows and builds the index over them.'
+        self.read()
+        self.build()
+
+    def read(self):
+        'Reads the parameter vectors and memory-maps the curves.'
+        P = len(self.params)
+        if self.count:
+            self.q = np.fromfile(os.path.join(self.path,'params.bin'),
+                                 count=self.count*P).reshape(self.count,P)
+        else:
+            self.q = np.empty((0,P))
+        self.map()
+
+    def map(self):
+        'Memory-maps the stored curves.'
+        if self.count:
+            self.curves = np.memmap(os.path.join(self.path,'curves.bin'),dtype=np.float64,
+                                    mode='r',shape=(self.count,self.Vin.size))
+        else:
+            self.curves = None
+
+    def build(self):
+        'Rebuilds the normalisation and KD-tree over all stored curves.'
+        if self.count:
+            self.lo = self.q.min(axis=0)
+            scale = self.q.max(axis=0)-self.lo
+        else:
+            self.lo = np.zeros(len(self.params))
+            scale = np.ones(len(self.params))
+        #parameters that do not vary are scaled relative to their value
+        scale[scale==0] = np.abs(self.lo[scale==0])
+        scale[scale==0] = 1
+        self.scale = scale
+        self.indexed = self.count
+        self.tree = cKDTree(self.normalise(self.q))
+
+    def normalise(self, q : Array[(Any,Any)]) -> Array[(Any,Any)]:
+        'Maps parameter vectors `q` into normalised parameter space.'
+        return (q-self.lo)/self.scale
+
+    def __len__(self):
+        return self.count
+
+    def insert(self, res : xr.DataArray, defaults : bool = False, **kwargs):
+        '''
+        Appends every curve of the `sweep`, `grid` or `scatter`
+        result `res` to the catalogue. Catalogued parameters that
+        are not coordinates of `res` must be passed as `kwargs`,
+        or left at the `chaogate` defaults if `defaults` is True.
+        '''
+        if not isinstance(res,list):
+            res = [res]
+        #check every result before writing any of them
+        Vin = self.Vin if self.Vin is not None else res[0].Vin.data.astype(np.float64)
+        for r in res:
+            vin = r.Vin.data.astype(np.float64)
+            if vin.shape!=Vin.shape or not np.allclose(vin,Vin):
+                raise ValueError('Vin of the inserted curves does not match the catalogue')
+            missing = [k for k in self.params if k not in r.coords and kwargs.get(k) is None]
+            if missing and not defaults:
+                raise ValueError(f'no value for the catalogued parameters {missing}; pass them '
+                                 'as kwargs, or defaults=True to use the chaogate defaults')
+        self.Vin = Vin
+        self.curves = None #a mapped file cannot be truncated on Windows
+        for r in res:
+            q = curve_params(r,self.params,**kwargs)
+            vout = np.ascontiguousarray(r.transpose(...,'Vin').data.reshape(-1,Vin.size),
+                                        dtype=np.float64)
+            for name,rows,width in (('params.bin',q,len(self.params)),
+                                    ('curves.bin',vout,Vin.size)):
+                with open(os.path.join(self.path,name),'ab') as f:
+                    #drop any rows left over from an interrupted insertion
+                    if os.path.getsize(f.name)>self.count*width*8:
+                        f.truncate(self.count*width*8)
+                    rows.tofile(f)
+            self.count += len(q)
+            self.write_meta()
+            self.q = np.concatenate([self.q,q])
+        self.map()
+        if self.count-self.indexed>self.rebuild*max(self.indexed,1):
+            self.build()
+
+    def point(self, **kwargs) -> Array[(Any,)]:
+        '''
+        Returns the normalised parameter vector of the design given
+        by `kwargs`, with unspecified parameters at their defaults.
+        '''
+        if not self.count:
+            raise ValueError('the catalogue is empty')
+        defaults = {k:v.default for k,v in inspect.signature(chaogate).parameters.items()}
+        defaults.update(compact_params)
+        for k in kwargs:
+            if k not in self.params:
+                raise TypeError(f"'{k}' is not a catalogued parameter")
+        q = np.array([kwargs.get(k,defaults.get(k)) for k in self.params],dtype=np.float64)
+        return self.normalise(q)
+
+    def rows(self, index : Array[(Any,)], distance : Array[(Any,)]) -> xr.DataArray:
+        '''
+        Returns the catalogued curves at `index` as a `DataArray`
+        with a `point` dimension, sorted by `distance`.
+        '''
+        order = np.argsort(distance,kind='stable')
+        index,distance = index[order],distance[order]
+        data = np.asarray(self.curves[index])
+        coords = dict(point=index,Vin=self.Vin,distance=('point',distance))
+        coords.update({k:('point',self.q[index,i]) for i,k in enumerate(self.params)})
+        return xr.DataArray(data=data,dims=['point','Vin'],coords=coords,name='vout')
+
+    def pending(self, x : Array[(Any,)]) -> Tuple[Array[(Any,)],Array[(Any,)]]:
+        'Returns the indices and distances of the curves not yet indexed.'
+        index = np.arange(self.indexed,self.count)
+        return index,np.linalg.norm(self.normalise(self.q[index])-x,axis=-1)
+
+    def nearest(self, k : int = 1, **kwargs) -> xr.DataArray:
+        '''
+        Returns the `k` catalogued curves nearest to the design
+        given by `kwargs` in normalised parameter space.
+        '''
+        x = self.point(**kwargs)
+        distance,index = self.tree.query(x,k=min(k,self.indexed)) if self.indexed \
+                         else (np.empty(0),np.empty(0,dtype=int))
+        index,distance = np.atleast_1d(index),np.atleast_1d(distance)
+        p_index,p_distance = self.pending(x)
+        index = np.concatenate([index,p_index])
+        distance = np.concatenate([distance,p_distance])
+        keep = np.argsort(distance,kind='stable')[:k]
+        return self.rows(index[keep],distance[keep])
+
+    def within(self, r : float, **kwargs) -> xr.DataArray:
+        '''
+        Returns all catalogued curves within distance `r` of the
+        design given by `kwargs` in normalised parameter space.
+        '''
+        x = self.point(**kwargs)
+        index = np.array(self.tree.query_ball_point(x,r),dtype=int)
+        distance = np.linalg.norm(self.normalise(self.q[index])-x,axis=-1)
+        p_index,p_distance = self.pending(x)
+        keep = p_distance<=r
+        return self.rows(np.concatenate([index,p_index[keep]]),
+                         np.concatenate([distance,p_distance[keep]]))
\ No newline at end of file
@@ -0,0 +1,294 @@
+# AUTOGENERATED! DO NOT EDIT! File to edit: 02_compact.ipynb (unless otherwise specified).
+
+__all__ = ['compact_model', 'compact_bounds', 'pack_model', 'compact_params', 'ekv_current', 'chaogate_kcl',
+           'compact_solve', 'compact_grid', 'compact_sweep', 'curve_params', 'calibrate']
+
+# Cell
+from chaogate import *
+import inspect
+from numba import prange
+from scipy.optimize import least_squares
+
+# Cell
+compact_model = {'nmos':dict(vt0=0.42,kp=270e-6,n=1.35,lam=0.15,tcv=-0.8e-3,bex=-1.5),
+                 'pmos':dict(vt0=0.38,kp=75e-6,n=1.40,lam=0.20,tcv=-0.8e-3,bex=-1.2)}
+
+# Cell
+compact_bounds = dict(vt0=(0.,1.2),kp=(1e-7,1e-2),n=(1.,3.),
+                      lam=(0.,2.),tcv=(-5e-3,5e-3),bex=(-3.,0.))
+
+# Cell
+def pack_model(model : Optional[Dict[str,Dict[str,float]]] = None) -> Array[(2,6)]:
+    '''
+    Packs the nested `model` dict of the form of `compact_model`
+    into a `(2,6)` array of nmos and pmos parameters ordered as
+    `compact_model['nmos']`. Missing entries take the defaults.
+    '''
+    m = copy.deepcopy(compact_model)
+    if model is not None:
+        for device,p in model.items():
+            m[device].update(p)
+    return np.array([[m[device][k] for k in compact_model['nmos']]
+                     for device in ('nmos','pmos')],dtype=np.float64)
+
+# Cell
+compact_params = {k:v.default for k,v in inspect.signature(chaogate).parameters.items()
+                  if k in ('Vdd','Vbias','w1','w2','w3','l1','l2','l3','TEMP')}
+compact_params['TEMP'] = 25
+
+# Cell
+@njit
+def ekv_current(vg : float,
+                vs : float,
+                vd : float,
+                p : Array[(6,)],
+                wl : float,
+                temp : float) -> float:
+    '''
+    Drain current in Amps of an EKV-style transistor with
+    gate, source and drain voltages `vg`, `vs`, `vd` referred
+    to the bulk, packed parameters `p` (a row of `pack_model`),
+    aspect ratio `wl` = W/L and temperature `temp` in Celsius.
+    '''
+    tk = temp + 273.15
+    ut = 8.617333262e-5 * tk
+    vt = p[0] + p[4] * (temp - 25.)
+    beta = p[1] * wl * (tk / 298.15) ** p[5]
+    n = p[2]
+    vp = (vg - vt) / n
+    xf = 0.5 * (vp - vs) / ut
+    xr = 0.5 * (vp - vd) / ut
+    #numerically safe softplus ln(1+e^x)
+    ff = xf + np.log1p(np.exp(-xf)) if xf > 0 else np.log1p(np.exp(xf))
+    fr = xr + np.log1p(np.exp(-xr)) if xr > 0 else np.log1p(np.exp(xr))
+    return 2. * n * beta * ut * ut * (ff * ff - fr * fr) * (1. + p[3] * (vd - vs))
+
+# Cell
+@njit
+def chaogate_kcl(vout : float,
+                 vin : float,
+                 q : Array[(9,)],
+                 m : Array[(2,6)]) -> float:
+    '''
+    Net current in Amps flowing into the `vout` node of the
+    chaogate with circuit parameters `q`, ordered as
+    `compact_params`, and packed model `m`.
+    '''
+    vdd, vbias, w1, w2, w3, l1, l2, l3, temp = q[0], q[1], q[2], q[3], q[4], q[5], q[6], q[7], q[8]
+    i1 = ekv_current(vin, 0., vout, m[0], w1 / l1, temp)
+    i2 = ekv_current(vdd - vbias, 0., vdd - vout, m[1], w2 / l2, temp)
+    i3 = ekv_current(vin, vout, vdd, m[0], w3 / l3, temp)
+    return i2 + i3 - i1
+
+# Cell
+@njit(parallel=True)
+def compact_solve(vin : Array[(Any,)],
+                  q : Array[(Any,9)],
+                  m : Array[(2,6)],
+                  tol : float = 1e-9) -> Array[(Any,Any)]:
+    '''
+    Solves the dc output voltage of the compact chaogate for
+    every input voltage in `vin` and every row of circuit
+    parameters in `q`. Returns an array of shape `[len(q),len(vin)]`.
+    '''
+    P = q.shape[0]
+    V = vin.size
+    vout = np.empty((P,V))
+    for j in prange(P):
+        for i in range(V):
+            #bracketed regula falsi with the Illinois modification
+            lo, hi = 0., q[j,0]
+            flo = chaogate_kcl(lo,vin[i],q[j],m)
+            fhi = chaogate_kcl(hi,vin[i],q[j],m)
+            side = 0
+            x = 0.5 * (lo + hi)
+            while hi - lo > tol:
+                x = (lo * fhi - hi * flo) / (fhi - flo) if fhi != flo else 0.5 * (lo + hi)
+                if not lo < x < hi: #stalled, bisect
+                    x = 0.5 * (lo + hi)
+                fx = chaogate_kcl(x,vin[i],q[j],m)
+                if fx > 0:
+                    if abs(x - lo) < tol:
+                        lo = x
+                        break
+                    lo, flo = x, fx
+                    if side == 1:
+                        fhi *= 0.5
+                    side = 1
+                elif fx < 0:
+                    if abs(hi - x) < tol:
+                        hi = x
+                        break
+                    hi, fhi = x, fx
+                    if side == -1:
+                        flo *= 0.5
+                    side = -1
+                else:
+                    break
+            vout[j,i] = x
+    return vout
+
+# Cell
+@sidis.timer
+def compact_grid(model : Optional[Dict[str,Dict[str,float]]] = None,
+                 tol : float = 1e-9,
+                 **kwargs):
+    '''
+    Like `grid`, but solved with the compact transistor `model`
+    (see `pack_model`) instead of `pyspice`. Returns the same
+    `kwargs`-dimensional hypercube as `grid`, ordered with the
+    `Vbias`, `Vdd` and `TEMP` dimensions innermost before `Vin`.
+    Scalar `kwargs` are kept as scalar coordinates.
+    '''
+    if kwargs.get('Vin') is None:
+        Vin = chaogate.Vin_tup
+    else:
+        Vin = kwargs.get('Vin')
+
+    sweep_kwargs = {'Vin':Vin}
+    static_kwargs = {}
+    for k,v in kwargs.items():
+        if k not in inspect.signature(chaogate).parameters:
+            raise TypeError(f"'{k}' is not a chaogate parameter")
+        if type(v) is tuple:
+            sweep_kwargs[k]=v
+        else:
+            static_kwargs[k]=v
+
+    #order dimensions as in grid
+    key={kwarg:3 for kwarg in kwargs}
+    key['Vin']=-1
+    key['Vbias']=0
+    key['Vdd']=1
+    key['TEMP']=2
+    sweep_kwargs=dict(sorted(sweep_kwargs.items(),key=lambda t:key[t[0]],reverse=True))
+    coords={k:tup2ar(*v) for k,v in sweep_kwargs.items()}
+
+    #broadcast every circuit parameter over the outer dimensions
+    outer=[k for k in coords if k!='Vin']
+    mesh=dict(zip(outer,np.meshgrid(*[coords[k] for k in outer],indexing='ij')))
+    shape=tuple(coords[k].size for k in outer)
+    q=np.empty(shape+(len(compact_params),))
+    for i,(k,v) in enumerate(compact_params.items()):
+        if k in mesh:
+            q[...,i]=mesh[k]
+        elif static_kwargs.get(k) is not None:
+            q[...,i]=static_kwargs[k]
+        else:
+            q[...,i]=v
+
+    vout=compact_solve(coords['Vin'],q.reshape(-1,len(compact_params)),pack_model(model),tol)
+    dims=list(coords)
+    #record static parameters as scalar coordinates
+    coords.update({k:v for k,v in static_kwargs.items() if np.isscalar(v) and not isinstance(v,str)})
+    return xr.DataArray(data=vout.reshape(shape+(coords['Vin'].size,)),
+                        dims=dims,
+                        coords=coords,
+                        name='vout')
+
+# Cell
+def compact_sweep(*funcs,
+                  model : Optional[Dict[str,Dict[str,float]]] = None,
+                  tol : float = 1e-9,
+                  **kwargs : Optional[Dict[str,Union[float,tuple]]]
+                 ) -> Union[List[Array],Array]:
+    '''
+    Like `sweep`, but solved with the compact transistor `model`.
+    Returns a 2-D `DataArray` of the `Vin` sweep against each
+    tupled `kwargs`, or a 1-D `DataArray` if only `Vin` is given.
+    If `funcs` is given, they are mapped over `vout` for each
+    sweep, and added as coordinates to the returned `DataArray`.
+    '''
+    sweep_kwargs = {k:v for k,v in kwargs.items() if type(v) is tuple and k!='Vin'}
+    static_kwargs = {k:v for k,v in kwargs.items() if k not in sweep_kwargs}
+
+    if not sweep_kwargs: #only sweep vin
+        vout=compact_grid(model,tol,**static_kwargs)
+        if funcs:
+            vout.coords.update({f.__name__:f(vout.data) for f in funcs})
+        return vout
+
+    res=[]
+    for k,s in sweep_kwargs.items():
+        vout=compact_grid(model,tol,**static_kwargs,**{k:s})
+        if funcs: #map functions as coordinates over data
+            vout.coords.update({f.__name__:(vout.dims[0],f(vout.data)) for f in funcs})
+        res+=[vout]
+
+    if len(res)==1: #if only 1 sweep, just pass back xar
+        res=res[0]
+
+    return res
+
+# Cell
+def curve_params(res : xr.DataArray,
+                 names : Sequence[str] = tuple(compact_params),
+                 **kwargs) -> Array[(Any,Any)]:
+    '''
+    Returns an array of shape `[res.size/res.Vin.size,len(names)]`
+    holding the value of each parameter in `names` for every curve
+    of `res`, in the (C-ordered) order of the curves.
+    '''
+    defaults = {k:v.default for k,v in inspect.signature(chaogate).parameters.items()}
+    defaults.update(compact_params)
+    template = res.isel(Vin=0,drop=True) if 'Vin' in res.dims else res
+    q = np.empty((template.size,len(names)))
+    for i,k in enumerate(names):
+        if k in res.coords and k!='Vin':
+            c = res.coords[k].reset_coords(drop=True)
+            q[:,i] = c.broadcast_like(template).transpose(*template.dims).data.ravel()
+        elif kwargs.get(k) is not None:
+            q[:,i] = kwargs[k]
+        else:
+            q[:,i] = defaults[k]
+    return q
+
+# Cell
+@sidis.timer
+def calibrate(res : Union[xr.DataArray,List[xr.DataArray]],
+              model : Optional[Dict[str,Dict[str,float]]] = None,
+              fit : Sequence[str] = ('vt0','kp','n','lam'),
+              devices : Sequence[str] = ('nmos','pmos'),
+              tol : float = 1e-6,
+              **kwargs) -> Tuple[Dict[str,Dict[str,float]],Dict[str,float]]:
+    '''
+    Fits the `fit` parameters of each of the `devices` in the
+    compact `model` to the `sweep` or `grid` result(s) `res`.
+    Any non-coordinate circuit parameters used to produce `res`
+    must be passed as `kwargs`. Returns the fitted model, in the
+    form of `compact_model`, and a dict of the root-mean-square,
+    mean absolute and maximum absolute fit errors in Volts.
+    '''
+    if not isinstance(res,list):
+        res=[res]
+    data=[(r.Vin.data.astype(np.float64),
+           curve_params(r,**kwargs),
+           r.data.reshape(-1,r.Vin.size)) for r in res]
+
+    m0=pack_model(model)
+    keys=list(compact_model['nmos'])
+    index=[(('nmos','pmos').index(d),keys.index(k)) for d in devices for k in fit]
+    if (0,1) in index and (1,1) in index: #only the ratio of the kp's is observable
+        index.remove((0,1))
+    x0=np.array([m0[i] for i in index])
+    bounds=np.array([compact_bounds[keys[i[1]]] for i in index]).T
+
+    def unpack(x):
+        m=m0.copy()
+        for i,v in zip(index,x):
+            m[i]=v
+        return m
+
+    def residual(x):
+        m=unpack(x)
+        return np.concatenate([(compact_solve(vin,q,m,tol)-vout).ravel()
+                               for vin,q,vout in data])
+
+    sol=least_squares(residual,np.clip(x0,*bounds),bounds=bounds,x_scale='jac')
+    m=unpack(sol.x)
+    fitted={d:dict(zip(keys,m[i].tolist())) for i,d in enumerate(('nmos','pmos'))}
+    err=np.abs(sol.fun)
+    error=dict(rmse=float(np.sqrt(np.mean(err**2))),
+               mean=float(np.mean(err)),
+               max=float(np.max(err)))
+    return fitted,error
\ No newline at end of file
@@ -1,7 +1,8 @@
 # AUTOGENERATED! DO NOT EDIT! File to edit: 00_core.ipynb (unless otherwise specified).
 
-__all__ = ['global_path', 'chaogate', 'tup2ar', 'sweep', 'print_xar', 'iterate_map', 'iterate', 'lyapunov', 'grid',
-           'bifurcate', 'booleanize_ar', 'booleanize', 'boolean_gradient', 'boolean_divergence']
+__all__ = ['global_path', 'chaogate', 'tup2ar', 'sweep', 'print_xar', 'iterate_kernel', 'iterate_map', 'iterate',
+           'lyapunov', 'grid', 'bifurcate', 'booleanize_ar', 'booleanize', 'boolean_gradient', 'boolean_divergence',
+           'Buffer', 'allocate', 'share', 'buffer_data', 'contiguous_view', 'attach', 'release', 'buffer_worker']
 
 # Cell
 import warnings
@@ -10,6 +11,7 @@ with warnings.catch_warnings(): #ignore warnings
 
     import copy
     import os
+    from collections import namedtuple
     import matplotlib.pyplot as plt
     import numpy as np
     import gzip
@@ -280,6 +282,26 @@ def print_xar(x):
     S+='Variables'+'\n\t'+'\n\t'.join(data)
     print(S)
 
+# Cell
+@njit
+def iterate_kernel(vo : Array[(Any,Any)],
+                   vin : Array[(Any)],
+                   v0 : float,
+                   X : Array[(Any,Any,2)]):
+    '''
+    Iterates each curve of `vo` : [J,size(vin)] from `v0`,
+    writing the map evaluations and first derivatives into
+    the preallocated array `X` : [J,N,2] in place.
+    '''
+    J,N = X.shape[0],X.shape[1]
+    dv=vin[1]-vin[0]
+    for j in range(J):
+        xn=v0
+        for i in range(N):
+            X[j,i,0]=xn
+            xn=np.interp(x=xn,xp=vin,fp=vo[j])
+        X[j,:,1]=np.interp(x=X[j,:,0],xp=vin[:-1],fp=np.diff(vo[j]))/dv
+
 # Cell
 @sidis.timer
 @njit
@@ -301,28 +323,40 @@ def iterate_map(vout : Array[(Any, ...)],
     vo = vout.reshape((int(vout.size/vin.size),vout.shape[-1]))
     J = vo.shape[0]
     X=np.zeros((J,N,2))
-    dv=vin[1]-vin[0]
-    for j in range(J):
-        xn=v0
-        for i in range(N):
-            X[j,i,0]=xn
-            xn=np.interp(x=xn,xp=vin,fp=vo[j])
-        X[j,:,1]=np.interp(x=X[j,:,0],xp=vin[:-1],fp=np.diff(vo[j]))/dv
+    iterate_kernel(vo,vin,v0,X)
     return X
 
 # Cell
 def iterate(res,
             v0 : float = 0,
-            N : int = None) -> Array[(2,...)]:
+            N : int = None,
+            out = None) -> Array[(2,...)]:
     '''
     Uses `iterate_map` with a default iteration number
     corresponding to the length of the input array `vout`,
     and reshapes according to this length. njit is unable
     to do this, so we use two functions.
+    `res` and `out` may be `Buffer` handles (see `share`);
+    if `out` is given, the orbits are written into it in place,
+    and `N` defaults to its number of iterations.
     '''
-    if N is None:
-        N=res.Vin.shape[-1]
-    X = iterate_map(res.data,res.Vin.data,v0,N)
+    if isinstance(res,Buffer):
+        res=attach(res)
+    if out is None:
+        if N is None:
+            N=res.Vin.shape[-1]
+        X = iterate_map(res.data,res.Vin.data,v0,N)
+        X = X.reshape(*res.shape[:-1],*X.shape[-2:])
+    else:
+        X = buffer_data(out)
+        if X.ndim<2 or X.shape[-1]!=2:
+            raise ValueError(f'out must end with the Iterations and Derivative axes, got shape {X.shape}')
+        if N is None:
+            N=X.shape[-2]
+        elif N!=X.shape[-2]:
+            raise ValueError(f'N={N} does not match the {X.shape[-2]} iterations of out')
+        iterate_kernel(np.ascontiguousarray(res.data).reshape(-1,res.shape[-1]),
+                       res.Vin.data,v0,contiguous_view(X,(-1,N,2)))
     dims = list(res.dims)
     if len(dims)==1:
         dims = []
@@ -336,19 +370,26 @@ def iterate(res,
                        )
 
 # Cell
-def lyapunov(x : Array[Any,...], replace_zeros_with : Union[int,float] = 0.01):
+def lyapunov(x : Array[Any,...], replace_zeros_with : Union[int,float] = 0.01, out = None):
     '''
     Returns average Lyapunov exponent of array 'x'.
     Replaces zeros with `replace_zeros_with` to
-    calculate log correctly.
+    calculate log correctly. `x` and `out` may be
+    `Buffer` handles; if `out` is given, the result
+    is written into it in place.
     '''
+    if isinstance(x,Buffer):
+        x=attach(x)
     if isinstance(x,xr.DataArray): #assume iterate map
         y=np.abs(x.data[...,1],dtype=np.float64)
     else:
         y=np.abs(x,dtype=np.float64)
     y[y==0]=replace_zeros_with
     y=np.log(y)
-    y=np.mean(y,axis=-1)
+    if out is None:
+        y=np.mean(y,axis=-1)
+    else:
+        y=np.mean(y,axis=-1,out=buffer_data(out))
     if not isinstance(x,xr.DataArray):
         return y
     else:
@@ -524,8 +565,10 @@ def booleanize_ar(vn, threshold=None):
 def booleanize(vn, threshold=None):
     '''
     Like `booleanize_ar`, but with typecasting
-    for `xarray.DataArray` inputs.
+    for `xarray.DataArray` and `Buffer` inputs.
     '''
+    if isinstance(vn,Buffer):
+        vn=attach(vn)
     if isinstance(vn,xr.DataArray):
         B=booleanize_ar(vn.data,threshold)
         return vn.copy(deep=False,data=B)
@@ -533,17 +576,22 @@ def booleanize(vn, threshold=None):
         return booleanize_ar(vn,threshold)
 
 # Cell
-def boolean_gradient(vn , threshold=None, dimensions_up_to=-1):
+def boolean_gradient(vn , threshold=None, dimensions_up_to=-1, out=None):
     '''
     Compute the `booleanize`d gradient of the
-    iterated map `vn`.
+    iterated map `vn`. `vn` and `out` may be `Buffer`
+    handles; if `out` is given, the gradient is
+    written into it in place.
     '''
     B = booleanize(vn,threshold)
     axes = tuple([i for i,s in enumerate(B.shape[:dimensions_up_to])])
     grad = np.gradient(B,axis=axes)
     if not isinstance(grad,list):
         grad = list(grad)
-    grad = np.array(grad)
+    if out is None:
+        grad = np.array(grad)
+    else:
+        grad = np.stack(grad,out=buffer_data(out))
     return grad
 
 # Cell
@@ -559,4 +607,161 @@ def boolean_divergence(grad , N=-1, normalize=False):
     div = np.mean(div,axis=0)
     if normalize:
         div /=np.max(div)
-    return div
\ No newline at end of file
+    return div
+
+# Cell
+Buffer = namedtuple('Buffer',['name','path','shape','dtype','dims','coords','array_name'])
+Buffer.__doc__ = '''
+    Picklable handle to an array held in shared memory (`name`)
+    or in a memory-mapped `.npy` file (`path`), along with the
+    `dims`, `coords` and `array_name` of its `xarray.DataArray`.
+    '''
+
+# Cell
+def allocate(shape : Tuple[int,...],
+             dims : Optional[Sequence[str]] = None,
+             coords : Optional[Mapping[str,Any]] = None,
+             array_name : Optional[str] = None,
+             dtype = np.float64,
+             path : Optional[str] = None) -> Buffer:
+    '''
+    Allocates a zeroed array of `shape` and `dtype` in shared
+    memory, or in a memory-mapped file at `path` if given,
+    and returns its `Buffer` handle. `dims`, `coords` and
+    `array_name` describe the `xarray.DataArray` it holds.
+    '''
+    shape = tuple(int(n) for n in shape)
+    dtype = np.dtype(dtype).str
+    if coords is not None:
+        coords = {k:(v.dims,np.asarray(v.data)) if isinstance(v,xr.DataArray) else v
+                  for k,v in coords.items()}
+    if path is None:
+        from multiprocessing import shared_memory #python 3.8+
+        shm = shared_memory.SharedMemory(create=True,
+                                         size=max(int(np.prod(shape))*np.dtype(dtype).itemsize,1))
+        attach.buffers[shm.name] = shm
+        handle = Buffer(shm.name,None,shape,dtype,dims,coords,array_name)
+        buffer_data(handle)[...] = 0
+    else:
+        np.lib.format.open_memmap(path,mode='w+',dtype=dtype,shape=shape).flush()
+        handle = Buffer(None,path,shape,dtype,dims,coords,array_name)
+    return handle
+
+# Cell
+def share(x : Union[xr.DataArray,Array[Any,...]],
+          path : Optional[str] = None) -> Buffer:
+    '''
+    Copies the array or `xarray.DataArray` `x` into shared
+    memory, or a memory-mapped file at `path`, and returns
+    its `Buffer` handle for passing to worker processes.
+    '''
+    if isinstance(x,xr.DataArray):
+        handle = allocate(x.shape,list(x.dims),x.coords,x.name,x.dtype,path)
+        buffer_data(handle)[...] = x.data
+    else:
+        handle = allocate(np.shape(x),dtype=np.asarray(x).dtype,path=path)
+        buffer_data(handle)[...] = x
+    return handle
+
+# Cell
+def buffer_data(x) -> Array[Any,...]:
+    '''
+    Returns the `numpy.ndarray` held by the `Buffer`,
+    `xarray.DataArray` or array `x`, without copying.
+    '''
+    if isinstance(x,Buffer):
+        if x.path is not None:
+            return np.load(x.path,mmap_mode='r+')
+        if x.name not in attach.buffers:
+            from multiprocessing import shared_memory
+            try: #don't let the resource tracker unlink buffers we didn't create
+                shm = shared_memory.SharedMemory(name=x.name,track=False)
+            except TypeError:
+                shm = shared_memory.SharedMemory(name=x.name)
+            attach.buffers[x.name] = shm
+        return np.ndarray(x.shape,dtype=x.dtype,buffer=attach.buffers[x.name].buf)
+    elif isinstance(x,xr.DataArray):
+        return x.data
+    else:
+        return x
+
+# Cell
+def contiguous_view(x : Array[Any,...], shape : Tuple[int,...]) -> Array[Any,...]:
+    '''
+    Reshapes `x` to `shape` without copying, raising a
+    `ValueError` if this would require a copy.
+    '''
+    y = x.reshape(shape)
+    if y.size and not np.shares_memory(x,y):
+        raise ValueError('out must be a contiguous array or buffer')
+    return y
+
+# Cell
+def attach(handle : Buffer) -> xr.DataArray:
+    '''
+    Wraps the array of the `Buffer` `handle` back into its
+    `xarray.DataArray`, without copying. Writes to the data
+    are visible to every process attached to the buffer.
+    '''
+    return xr.DataArray(data=buffer_data(handle),
+                        dims=handle.dims,
+                        coords=handle.coords,
+                        name=handle.array_name)
+
+# Cell
+attach.buffers = {}
+
+# Cell
+def release(handle : Buffer, unlink : bool = True):
+    '''
+    Closes this process' view of the `Buffer` `handle`, and
+    if `unlink`, frees the shared memory or deletes the file.
+    Call with `unlink=True` once, from the creating process,
+    after all arrays attached to the buffer are discarded.
+    '''
+    if handle.path is not None:
+        if unlink:
+            os.remove(handle.path)
+        return
+    shm = attach.buffers.pop(handle.name,None)
+    if shm is None:
+        from multiprocessing import shared_memory
+        shm = shared_memory.SharedMemory(name=handle.name)
+    shm.close()
+    if unlink:
+        shm.unlink()
+
+# Cell
+def buffer_worker(func : Callable,
+                  handle : Buffer,
+                  out : Optional[Buffer] = None,
+                  start : Optional[int] = None,
+                  stop : Optional[int] = None,
+                  **kwargs):
+    '''
+    Applies `func` (e.g. `iterate`, `lyapunov` or `boolean_gradient`)
+    with `kwargs` to the slice `start:stop` of the leading dimension
+    of the `Buffer` `handle`, writing into the same slice of `out`
+    if given. Returns `None` when writing to `out`, so that no data
+    is pickled back from worker processes.
+    For `boolean_gradient`, `out` is sliced along its second axis,
+    after the gradient direction, and the gradient is taken with
+    one extra row on each side of the slice so that it matches the
+    unsliced result. An unspecified `threshold` is taken over the
+    whole of `handle`, as in `booleanize_ar`.
+    '''
+    s = slice(start,stop)
+    if func is boolean_gradient:
+        x = attach(handle)
+        if kwargs.get('threshold') is None:
+            kwargs['threshold'] = (np.max(x.data)-np.min(x.data))/2
+        lo,hi,_ = s.indices(x.shape[0])
+        a,b = max(lo-1,0),min(hi+1,x.shape[0])
+        grad = func(x[a:b],**kwargs)[:,lo-a:hi-a]
+        if out is None:
+            return grad
+        buffer_data(out)[:,lo:hi] = grad
+        return
+    if out is None:
+        return func(attach(handle)[s],**kwargs)
+    func(attach(handle)[s],out=attach(out)[s],**kwargs)
\ No newline at end of file
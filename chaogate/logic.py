@@ -0,0 +1,107 @@
+# AUTOGENERATED! DO NOT EDIT! File to edit: 04_logic.ipynb (unless otherwise specified).
+
+__all__ = ['logic_names', 'logic_inputs', 'logic_map', 'logic']
+
+# Cell
+from chaogate import *
+from chaogate.network import uniform_interp
+from numba import prange
+
+# Cell
+logic_names = {1:['FALSE','NOT','BUFFER','TRUE'],
+               2:['FALSE','NOR','NOT A AND B','NOT A','A AND NOT B','NOT B','XOR','NAND',
+                  'AND','XNOR','B','NOT A OR B','A','A OR NOT B','OR','TRUE']}
+
+# Cell
+def logic_inputs(n : int = 2) -> Array[(Any,Any)]:
+    '''
+    Returns the `[2**n,n]` array of all input combinations
+    of `n` bits, in the order used to encode truth tables.
+    '''
+    c = np.arange(2**n)
+    return (c[:,None]>>np.arange(n-1,-1,-1)[None,:])&1
+
+# Cell
+@njit(parallel=True)
+def logic_map(vo : Array[(Any,Any)],
+              vin : Array[(Any,)],
+              x0 : Array[(Any,Any)],
+              k : int) -> Array[(Any,Any,Any)]:
+    '''
+    Iterates each of the curves `vo` : [J,size(vin)] `k` times
+    from each initial voltage in `x0` : [S,C], where `S` indexes
+    encoding settings and `C` input combinations. Returns the
+    final voltages as an array of shape [S,J,C].
+    '''
+    J = vo.shape[0]
+    S,C = x0.shape
+    dv = vin[1] - vin[0]
+    X = np.empty((S,J,C))
+    for j in prange(J):
+        for s in range(S):
+            for c in range(C):
+                x = x0[s,c]
+                for i in range(k):
+                    x = uniform_interp(x,vin[0],dv,vo[j])
+                X[s,j,c] = x
+    return X
+
+# Cell
+@sidis.timer
+def logic(res : xr.DataArray,
+          v0 : Union[float,tuple] = 0.45,
+          dv : Union[float,tuple,Sequence[float]] = 0.1,
+          k : int = 1,
+          n : int = 2,
+          threshold : Optional[float] = None) -> xr.Dataset:
+    '''
+    Classifies the `n`-input Boolean function implemented after
+    `k` iterations by every curve of `res`, with inputs encoded
+    as initial voltages `v0+dv*inputs` and outputs `booleanize`d
+    about `threshold`. Returns an `xarray.Dataset` holding the
+    `truth` table, its integer `function` code and `label` (for
+    `n` in `logic_names`), and the noise `margin` in Volts.
+    '''
+    if not 0<n<=5:
+        raise ValueError(f'n must be between 1 and 5, got {n}')
+    vin = res.Vin.data.astype(np.float64)
+
+    #gather swept encodings as leading dimensions
+    coords = {}
+    if type(v0) is tuple:
+        coords['v0'] = v0 = tup2ar(*v0)
+    if type(dv) is tuple:
+        coords['dv'] = dv = tup2ar(*dv)
+    inputs = logic_inputs(n)
+    step = np.asarray(dv,dtype=np.float64)
+    if 'dv' in coords or step.ndim==0: #same step for every input
+        offsets = inputs.sum(axis=1)[None,None,:]*np.atleast_1d(step)[None,:,None]
+    elif step.ndim==1:
+        if step.size!=n:
+            raise ValueError(f'dv has {step.size} entries for {n} inputs')
+        offsets = (inputs@step)[None,None,:]
+    else:
+        raise ValueError(f'dv must be a scalar, a tuple or a 1-D sequence, got shape {step.shape}')
+    x0 = (np.atleast_1d(v0)[:,None,None]+offsets).reshape(-1,2**n)
+
+    vo = np.ascontiguousarray(res.data.reshape(-1,vin.size),dtype=np.float64)
+    X = logic_map(vo,vin,x0,k)
+
+    batch_dims = list(coords)+list(res.dims[:-1])
+    shape = tuple(c.size for c in coords.values())+res.shape[:-1]
+    X = X.reshape(shape+(2**n,))
+    if threshold is None: #as in booleanize_ar
+        threshold = (np.max(X)-np.min(X))/2
+    bits = booleanize_ar(X,threshold).astype(np.uint8)
+    code = (bits.astype(np.int64)<<np.arange(2**n)).sum(axis=-1)
+    margin = np.abs(X-threshold).min(axis=-1)
+
+    coords.update({c:v for c,v in res.coords.items() if c!='Vin'})
+    coords['Inputs'] = [''.join(map(str,i)) for i in inputs]
+    ds = xr.Dataset(data_vars=dict(truth=(batch_dims+['Inputs'],bits),
+                                   function=(batch_dims,code),
+                                   margin=(batch_dims,margin)),
+                    coords=coords)
+    if n in logic_names:
+        ds['label'] = (batch_dims,np.array(logic_names[n])[code])
+    return ds
\ No newline at end of file
@@ -0,0 +1,255 @@
+# AUTOGENERATED! DO NOT EDIT! File to edit: 03_network.ipynb (unless otherwise specified).
+
+__all__ = ['ring', 'lattice', 'coupling', 'uniform_interp', 'network_map', 'stream_network', 'network']
+
+# Cell
+from chaogate import *
+from numba import prange
+import scipy.sparse
+
+# Cell
+def ring(M : int, k : int = 1) -> scipy.sparse.csr_matrix:
+    '''
+    Adjacency matrix of a ring of `M` nodes, each coupled
+    to its `k` nearest neighbors on either side. Nodes are
+    never coupled to themselves, so a ring of 1 node is empty.
+    '''
+    offsets = [o for o in range(-k,k+1) if o!=0]
+    A = scipy.sparse.diags([1.]*len(offsets),offsets,shape=(M,M),format='lil')
+    for o in range(1,k+1): #wrap around
+        A.setdiag(1.,M-o)
+        A.setdiag(1.,o-M)
+    A.setdiag(0.) #wrapping by a multiple of M gives self-loops
+    A = A.tocsr()
+    A.eliminate_zeros()
+    return A
+
+# Cell
+def lattice(*shape : int, periodic : bool = True) -> scipy.sparse.csr_matrix:
+    '''
+    Adjacency matrix of a lattice of the given `shape`, with each
+    node coupled to its nearest neighbors along every axis. Nodes
+    are numbered in C order. If `periodic`, the edges wrap around;
+    axes of size 1 add no coupling.
+    '''
+    A = None
+    for axis,n in enumerate(shape):
+        line = ring(n) if periodic else \
+               scipy.sparse.diags([1.,1.],[-1,1],shape=(n,n),format='csr')
+        before = scipy.sparse.identity(int(np.prod(shape[:axis])))
+        after = scipy.sparse.identity(int(np.prod(shape[axis+1:])))
+        term = scipy.sparse.kron(scipy.sparse.kron(before,line),after)
+        A = term if A is None else A+term
+    return scipy.sparse.csr_matrix(A)
+
+# Cell
+def coupling(adjacency) -> Tuple[Array[(Any,)],Array[(Any,)],Array[(Any,)]]:
+    '''
+    Returns the `(indptr,indices,weights)` compressed sparse row
+    arrays of the dense or `scipy.sparse` `adjacency` matrix,
+    with each row normalized to sum to 1. Isolated nodes have
+    no weights and are uncoupled.
+    '''
+    A = scipy.sparse.csr_matrix(adjacency,dtype=np.float64)
+    if A.shape[0]!=A.shape[1]:
+        raise ValueError(f'adjacency must be square, got shape {A.shape}')
+    A.eliminate_zeros()
+    degree = np.asarray(A.sum(axis=1)).ravel()
+    degree[degree==0] = 1
+    A = scipy.sparse.diags(1/degree) @ A
+    A.sort_indices()
+    return A.indptr.astype(np.int64),A.indices.astype(np.int64),A.data
+
+# Cell
+@njit
+def uniform_interp(x : float,
+                   x0 : float,
+                   dx : float,
+                   fp : Array[(Any,)]) -> float:
+    '''
+    Equivalent to `np.interp(x,xp,fp)` for a uniform
+    grid `xp` starting at `x0` with spacing `dx`.
+    '''
+    t = (x - x0) / dx
+    if t <= 0:
+        return fp[0]
+    if t >= fp.size - 1:
+        return fp[-1]
+    i = int(t)
+    return fp[i] + (t - i) * (fp[i+1] - fp[i])
+
+# Cell
+@njit(parallel=True)
+def network_map(curves : Array[(Any,Any)],
+                slopes : Array[(Any,Any)],
+                node_curve : Array[(Any,Any)],
+                vin : Array[(Any,)],
+                indptr : Array[(Any,)],
+                indices : Array[(Any,)],
+                weights : Array[(Any,)],
+                eps : Array[(Any,)],
+                x : Array[(Any,Any)],
+                dx : Array[(Any,Any)],
+                threshold : float,
+                replace_zeros_with : float,
+                sync : Array[(Any,Any)],
+                bits : Array[(Any,Any,Any)],
+                lyap : Array[(Any,)]):
+    '''
+    Iterates the coupled map lattice for `sync.shape[1]` steps.
+    `curves` and `slopes` : [C,size(vin)] are the transfer curves
+    and their derivatives, `node_curve` : [B,M] the curve of each
+    node, `x` and `dx` : [B,M] the states and tangent vectors,
+    updated in place along with the outputs `sync` : [B,N],
+    `bits` : [B,N,M] and `lyap` : [B].
+    '''
+    B,M = x.shape
+    N = sync.shape[1]
+    dv = vin[1] - vin[0]
+    for b in prange(B):
+        fx = np.empty(M)
+        dfx = np.empty(M)
+        for n in range(N):
+            for i in range(M):
+                c = node_curve[b,i]
+                fx[i] = uniform_interp(x[b,i],vin[0],dv,curves[c])
+                dfx[i] = uniform_interp(x[b,i],vin[0],dv,slopes[c]) * dx[b,i]
+            norm = 0.
+            mean = 0.
+            for i in range(M):
+                xn = fx[i]
+                dxn = dfx[i]
+                if indptr[i+1]>indptr[i]:
+                    xn *= 1-eps[b]
+                    dxn *= 1-eps[b]
+                    for k in range(indptr[i],indptr[i+1]):
+                        xn += eps[b] * weights[k] * fx[indices[k]]
+                        dxn += eps[b] * weights[k] * dfx[indices[k]]
+                x[b,i] = xn
+                dx[b,i] = dxn
+                norm += dxn * dxn
+                mean += xn
+                bits[b,n,i] = 1 if xn>=threshold else 0
+            mean /= M
+            var = 0.
+            for i in range(M):
+                var += (x[b,i]-mean)**2
+            sync[b,n] = np.sqrt(var/M)
+            norm = np.sqrt(norm)
+            if norm==0: #restart a collapsed tangent vector
+                lyap[b] += np.log(replace_zeros_with)
+                dx[b,:] = 1/np.sqrt(M)
+            else:
+                lyap[b] += np.log(norm)
+                dx[b,:] /= norm
+
+# Cell
+def stream_network(res : xr.DataArray,
+                   adjacency,
+                   eps : Union[float,tuple] = 0.1,
+                   v0 : Optional[Union[float,Array[(Any,)]]] = None,
+                   N : int = 1000,
+                   T : int = 0,
+                   chunk : int = 1000,
+                   threshold : Optional[float] = None,
+                   node_dim : Optional[str] = None,
+                   replace_zeros_with : float = 0.01,
+                   seed : Optional[int] = None) -> Iterable[xr.Dataset]:
+    '''
+    Iterates the network of chaogates coupled by `adjacency` with
+    transfer curves `res`, yielding an `xarray.Dataset` for every
+    `chunk` of the `N` iterations following a discarded transient
+    of `T` iterations. Each dataset holds the node spread `sync`,
+    the `booleanize`d states `bits` about `threshold`, the running
+    maximal `lyapunov` exponent and the current node `state`.
+    Initial states `v0` default to uniform random voltages over
+    `Vin`, drawn with `seed` and shared by the whole batch.
+    '''
+    indptr,indices,weights = coupling(adjacency)
+    M = indptr.size-1
+    vin = res.Vin.data.astype(np.float64)
+    if threshold is None: #as in booleanize
+        threshold = (vin.max()-vin.min())/2
+
+    #move the node dimension next to Vin and flatten the rest into the batch
+    if node_dim is not None:
+        if res.sizes[node_dim]!=M:
+            raise ValueError(f"'{node_dim}' has size {res.sizes[node_dim]}, but the network has {M} nodes")
+        res = res.transpose(...,node_dim,'Vin')
+        batch_dims = list(res.dims[:-2])
+    else:
+        batch_dims = list(res.dims[:-1])
+    batch_shape = tuple(res.sizes[d] for d in batch_dims)
+    curves = np.ascontiguousarray(res.data.reshape(-1,vin.size),dtype=np.float64)
+    slopes = np.diff(curves,axis=-1)/(vin[1]-vin[0])
+    R = int(np.prod(batch_shape))
+    if node_dim is not None:
+        node_curve = np.arange(R*M).reshape(R,M)
+    else:
+        node_curve = np.repeat(np.arange(R)[:,None],M,axis=1)
+
+    coords = {k:v for k,v in res.coords.items()
+              if k not in ('Vin',node_dim) and set(v.dims)<=set(batch_dims)}
+    if type(eps) is tuple:
+        eps = tup2ar(*eps)
+        coords['eps'] = eps
+        batch_dims = ['eps']+batch_dims
+        batch_shape = (eps.size,)+batch_shape
+        node_curve = np.tile(node_curve,(eps.size,1))
+        eps = np.repeat(eps,R)
+    else:
+        eps = np.full(R,eps,dtype=np.float64)
+    B = eps.size
+
+    if v0 is None:
+        v0 = np.random.default_rng(seed).uniform(vin.min(),vin.max(),M)
+    x = np.empty((B,M))
+    x[:] = v0
+    dx = np.full((B,M),1/np.sqrt(M))
+
+    def run(n):
+        sync = np.empty((B,n))
+        bits = np.empty((B,n,M),dtype=np.uint8)
+        lyap = np.zeros(B)
+        network_map(curves,slopes,node_curve,vin,indptr,indices,weights,eps,
+                    x,dx,threshold,replace_zeros_with,sync,bits,lyap)
+        return sync,bits,lyap
+
+    for start in range(0,T,chunk): #transient
+        run(min(chunk,T-start))
+
+    total = np.zeros(B)
+    for start in range(0,N,chunk):
+        n = min(chunk,N-start)
+        sync,bits,lyap = run(n)
+        total += lyap
+        ds = xr.Dataset(
+            data_vars=dict(
+                sync=(batch_dims+['Iterations'],sync.reshape(batch_shape+(n,))),
+                bits=(batch_dims+['Iterations','Node'],bits.reshape(batch_shape+(n,M))),
+                lyapunov=(batch_dims,(total/(start+n)).reshape(batch_shape)),
+                state=(batch_dims+['Node'],x.copy().reshape(batch_shape+(M,)))),
+            coords=dict(coords,Iterations=np.arange(T+start,T+start+n),Node=np.arange(M)))
+        yield ds
+
+# Cell
+@sidis.timer
+def network(res : xr.DataArray,
+            adjacency,
+            eps : Union[float,tuple] = 0.1,
+            v0 : Optional[Union[float,Array[(Any,)]]] = None,
+            N : int = 1000,
+            T : int = 0,
+            chunk : int = 1000,
+            **kwargs) -> xr.Dataset:
+    '''
+    Like `stream_network`, but returns all `N` iterations
+    as a single `xarray.Dataset`. See `stream_network` for the
+    remaining `kwargs`.
+    '''
+    if N<1:
+        raise ValueError(f'N must be at least 1, got {N}')
+    chunks = list(stream_network(res,adjacency,eps,v0,N,T,chunk,**kwargs))
+    ds = xr.concat([c[['sync','bits']] for c in chunks],dim='Iterations')
+    ds.update(chunks[-1][['lyapunov','state']])
+    return ds
\ No newline at end of file
@@ -0,0 +1,112 @@
+# AUTOGENERATED! DO NOT EDIT! File to edit: 05_sampling.ipynb (unless otherwise specified).
+
+__all__ = ['design', 'scatter']
+
+# Cell
+from chaogate import *
+
+# Cell
+def design(n : int,
+           d : int,
+           method : str = 'sobol',
+           seed : Optional[int] = None) -> Array[(Any,Any)]:
+    '''
+    Returns an `[n,d]` array of points in the unit hypercube drawn
+    with `method`, one of 'sobol' (scrambled Sobol sequence),
+    'halton' (scrambled Halton sequence), 'lhs' (Latin hypercube)
+    or 'random' (uniform), using the random `seed`.
+    '''
+    if method=='random':
+        return np.random.default_rng(seed).random((n,d))
+    from scipy.stats import qmc
+    if method=='sobol':
+        sampler = qmc.Sobol(d,seed=seed)
+    elif method=='halton':
+        sampler = qmc.Halton(d,seed=seed)
+    elif method=='lhs':
+        sampler = qmc.LatinHypercube(d,seed=seed)
+    else:
+        raise ValueError(f"unknown method '{method}'")
+    with warnings.catch_warnings(): #sobol prefers powers of 2
+        warnings.simplefilter("ignore")
+        return sampler.random(n)
+
+# Cell
+@sidis.timer
+def scatter(n : int,
+            method : str = 'sobol',
+            seed : Optional[int] = None,
+            **kwargs):
+    '''
+    Like `grid`, but over `n` points of the tupled `kwargs`
+    drawn from the `design` `method`. Sweeps over `Vbias`,
+    `Vdd` and `TEMP` are kept whole within each point, and
+    evaluated with the `simulator().dc` function call.
+    Returns an `xarray.DataArray` with a leading `point` dimension,
+    and the scalar `kwargs` as scalar coordinates.
+    '''
+    if kwargs.get('Vin') is None:
+        Vin = chaogate.Vin_tup
+    else:
+        Vin = kwargs.get('Vin')
+
+    dc_kwargs = {}
+    scatter_kwargs = {}
+    static_kwargs = {}
+    for k,v in kwargs.items():
+        if k=='Vin':
+            continue
+        elif type(v) is not tuple:
+            static_kwargs[k]=v
+        elif k in ('Vbias','Vdd','TEMP'):
+            dc_kwargs[k]=v
+        else:
+            scatter_kwargs[k]=v
+    if not scatter_kwargs:
+        raise ValueError('no parameters to scatter; use grid for Vbias, Vdd and TEMP alone')
+
+    #scale the unit design to the parameter ranges
+    lo = np.array([v[0] for v in scatter_kwargs.values()])
+    hi = np.array([v[1] for v in scatter_kwargs.values()])
+    points = lo+(hi-lo)*design(n,len(scatter_kwargs),method,seed)
+
+    #order dc sweeps as in grid; the innermost is evaluated in the dc call
+    key={'Vbias':0,'Vdd':1,'TEMP':2}
+    dc_kwargs=dict(sorted(dc_kwargs.items(),key=lambda t:key[t[0]],reverse=True))
+    coords={k:tup2ar(*v) for k,v in dc_kwargs.items()}
+    coords['Vin']=tup2ar(*Vin)
+    if dc_kwargs:
+        inner=list(dc_kwargs)[-1]
+        inner_slice={inner:slice(*dc_kwargs[inner])}
+        outer={k:coords[k] for k in list(dc_kwargs)[:-1]}
+    else:
+        inner_slice={}
+        outer={}
+
+    shape=tuple(c.size for c in coords.values())
+    arr=np.zeros((n,)+shape)
+    for p in range(n):
+        point_args={k:points[p,i] for i,k in enumerate(scatter_kwargs)}
+        for s in np.ndindex(tuple(c.size for c in outer.values())):
+            outer_args={k:v[s[i]] for i,(k,v) in enumerate(outer.items())}
+            circuit=chaogate(**{**static_kwargs,**point_args,**outer_args})
+
+            #get temperature of current sweep
+            if outer_args.get('TEMP') is not None:
+                temp=outer_args['TEMP']
+            elif static_kwargs.get('TEMP') is not None:
+                temp=static_kwargs['TEMP']
+            else:
+                temp=25
+
+            f=circuit.simulator(temperature=temp,nominal_temperature=25).dc
+            vout=f(Vin=slice(*Vin),**inner_slice).vout
+            arr[(p,)+s]=np.array(vout).reshape(shape[len(outer):])
+
+    coords['point']=np.arange(n)
+    coords.update({k:('point',points[:,i]) for i,k in enumerate(scatter_kwargs)})
+    coords.update({k:v for k,v in static_kwargs.items() if np.isscalar(v) and not isinstance(v,str)})
+    return xr.DataArray(data=arr,
+                        dims=['point']+list(dc_kwargs)+['Vin'],
+                        coords=coords,
+                        name='vout')
\ No newline at end of file